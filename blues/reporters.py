@@ -1,6 +1,10 @@
 import logging
+import os
+import queue
 import sys
+import threading
 import time
+from collections import OrderedDict
 
 import numpy as np
 import parmed
@@ -8,13 +12,45 @@ import simtk.unit as unit
 from mdtraj.reporters import HDF5Reporter
 from mdtraj.utils import unitcell
 from parmed import unit as u
-from parmed.geometry import box_vectors_to_lengths_and_angles
+from parmed.openmm.reporters import FRCUNIT, VELUNIT
 from simtk.openmm import app
 
-import blues._version
 import blues.reporters
 from blues.formats import *
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _scale_into(src, scale, out):
+    """
+    Multiply `src` by the scalar `scale` into `out`, narrowing to `out`'s
+    dtype on the store. This is the per-frame numeric core of the trajectory
+    reporters; when numba is importable it is replaced below by a compiled
+    loop that fuses the scale and the narrowing in one pass.
+    """
+    np.multiply(src, scale, out=out, casting='unsafe')
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _scale_into(src, scale, out):
+        for i in range(src.shape[0]):
+            for j in range(src.shape[1]):
+                out[i, j] = src[i, j] * scale
+
+#Unit expressions resolved once at import time; the per-report code paths
+#reference these instead of rebuilding the composite units on every call.
+_KELVIN = unit.kelvin
+_DALTON = unit.dalton
+_NM = unit.nanometer
+_NM3 = unit.nanometer**3
+_KJ_PER_MOL = unit.kilojoules_per_mole
+_G_PER_ML = unit.gram / unit.item / unit.milliliter
+
 
 def _check_mode(m, modes):
     """
@@ -24,6 +60,167 @@ def _check_mode(m, modes):
         raise ValueError('This operation is only available when a file ' 'is open in mode="%s".' % m)
 
 
+#Step count returned from describeNextReport when a frame-index schedule
+#has no reports left; large enough that OpenMM never calls back.
+_NO_REPORTS = 1 << 30
+
+
+def _reporting_disabled(enabled):
+    """
+    Resolve the reporter kill-switch: either the `enabled` ctor kwarg or the
+    BLUES_DISABLE_REPORTERS environment variable set to a truthy value.
+    """
+    if not enabled:
+        return True
+    return os.environ.get('BLUES_DISABLE_REPORTERS', '0') not in ('', '0', 'false', 'False')
+
+
+def _steps_to_next_frame(sorted_frames, current_step):
+    """
+    Return the number of steps from `current_step` until the next scheduled
+    report, given a sorted ndarray of (zero-shifted) frame indices.
+
+    Reports fire one step after each stored index, so a step sitting on an
+    index returns 1. Returns `_NO_REPORTS` when the schedule is exhausted,
+    so OpenMM can skip ahead instead of polling the reporter every step.
+
+    Parameters
+    ----------
+    sorted_frames : np.ndarray, dtype=int64
+        The sorted, zero-shifted frame indices to report at.
+    current_step : int
+        The current step of the simulation.
+
+    Returns
+    -------
+    steps : int
+        The number of steps until the next report.
+    """
+    idx = np.searchsorted(sorted_frames, current_step, side='left')
+    if idx == len(sorted_frames):
+        return _NO_REPORTS
+    return int(sorted_frames[idx]) - current_step + 1
+
+
+#Schedules whose largest frame index stays below this bound get a packed
+#bitmask; anything sparser falls back to the frozenset.
+_FRAME_BITS_MAX = 1 << 24
+
+
+def _pack_frame_bits(frame_indices):
+    """
+    Pack the (zero-shifted) frame indices into a uint64 bitmask, or return
+    None when the schedule is empty or its largest index is too big for a
+    mask to be worthwhile.
+
+    Membership becomes one shift and AND against a word of the mask, which
+    beats set hashing for the dense schedules NCMC lambda windows produce.
+
+    Parameters
+    ----------
+    frame_indices : list or np.ndarray of int
+        The zero-shifted frame indices to report at.
+
+    Returns
+    -------
+    np.ndarray of uint64, or None
+    """
+    idx = np.asarray(frame_indices, dtype=np.int64)
+    if idx.size == 0:
+        return None
+    if int(idx.max()) >= _FRAME_BITS_MAX or int(idx.min()) < 0:
+        return None
+    bits = np.zeros((int(idx.max()) >> 6) + 1, dtype=np.uint64)
+    np.bitwise_or.at(bits, idx >> 6, np.uint64(1) << (idx & 63).astype(np.uint64))
+    return bits
+
+
+def _frame_bit_set(bits, step):
+    """Test one step against a `_pack_frame_bits` mask."""
+    return (step >> 6) < len(bits) and bool(bits[step >> 6] & (np.uint64(1) << np.uint64(step & 63)))
+
+
+def _drain_writes(work_queue, traj, exc_holder):
+    """
+    Writer-thread loop for NetCDF4Reporter: pop (start, stop, data) batches
+    off `work_queue` and write each slab into `traj` until the None sentinel
+    arrives.
+
+    Deliberately a module function over the queue, the NetCDF4Traj and a
+    shared exception list -- never the reporter itself. A bound-method
+    target would pin the reporter alive from the thread's stack, so its
+    __del__ (the only close() path when callers drop the reporter) could
+    never run and the final partial batch would never reach the file.
+
+    Parameters
+    ----------
+    work_queue : queue.Queue
+        Source of write batches; None shuts the loop down.
+    traj : NetCDF4Traj
+        The open trajectory to write into.
+    exc_holder : list
+        Failures are appended here for the simulation thread to re-raise.
+    """
+    while True:
+        item = work_queue.get()
+        if item is None:
+            return
+        start, stop, data = item
+        try:
+            variables = traj._ncfile.variables
+            for key, value in data.items():
+                variables[key][start:stop] = value
+            #Sync unconditionally (traj.flush() respects sync_on_write and
+            #would be a no-op here): the NETCDF3 header's record count is
+            #only updated on sync/close, so without this a concurrent
+            #reader sees zero frames until the file is closed.
+            traj._ncfile.sync()
+        except Exception as e:
+            #Surface the failure on the simulation thread at the next flush
+            #or on close; keep draining so put() never deadlocks.
+            exc_holder.append(e)
+
+
+#Reporters attached at the same interval each ask OpenMM for the same
+#arrays, and getPositions(asNumpy=True) allocates a fresh copy per call.
+#Memoize the raw arrays per State object; the State is pinned inside each
+#entry so its id cannot be recycled while the entry is alive, and only the
+#most recent few States are kept to bound memory.
+_STATE_CACHE_SIZE = 4
+_state_cache = OrderedDict()
+
+
+def _state_array(state, getter_name):
+    """
+    Return the raw ndarray behind `state.<getter_name>(asNumpy=True)`,
+    memoized per State object.
+
+    Values are in OpenMM's native units (nm, nm/ps, kJ/mol/nm); callers
+    apply their own cached scale factors.
+
+    Parameters
+    ----------
+    state : :class:`mm.State`
+        The State to query.
+    getter_name : str
+        One of 'getPositions', 'getVelocities' or 'getForces'.
+
+    Returns
+    -------
+    np.ndarray
+        The array wrapped by the returned Quantity.
+    """
+    key = (id(state), getter_name)
+    hit = _state_cache.get(key)
+    if hit is not None:
+        return hit[1]
+    value = getattr(state, getter_name)(asNumpy=True)._value
+    _state_cache[key] = (state, value)
+    while len(_state_cache) > _STATE_CACHE_SIZE:
+        _state_cache.popitem(last=False)
+    return value
+
+
 def addLoggingLevel(levelName, levelNum, methodName=None):
     """
     Comprehensively adds a new logging level to the `logging` module and the
@@ -77,7 +274,11 @@ def addLoggingLevel(levelName, levelNum, methodName=None):
             self._log(levelNum, message, args, **kwargs)
 
     def logToRoot(message, *args, **kwargs):
-        logging.log(levelNum, message, *args, **kwargs)
+        # Check the root logger's level up front so calls at a disabled
+        # level are true no-ops; callers with expensive messages can do the
+        # same themselves, e.g. `if logger.isEnabledFor(logging.REPORT): ...`
+        if logging.getLogger().isEnabledFor(levelNum):
+            logging.log(levelNum, message, *args, **kwargs)
 
     logging.addLevelName(levelNum, levelName)
     setattr(logging, levelName, levelNum)
@@ -85,6 +286,35 @@ def addLoggingLevel(levelName, levelNum, methodName=None):
     setattr(logging, methodName, logToRoot)
 
 
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler that writes through a large in-memory buffer instead of
+    flushing after every record. High-frequency reporter output otherwise
+    pays a syscall per logged line; the buffer drains when it fills and when
+    the handler is closed.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the log file to append to.
+    mode : str, default='a'
+        The mode to open the log file in.
+    buffering : int, default=65536
+        Size in bytes of the buffer handed to open().
+    """
+
+    def __init__(self, filename, mode='a', buffering=1 << 16):
+        self._buffering = buffering
+        super(_BufferedFileHandler, self).__init__(filename, mode=mode)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self._buffering, encoding=self.encoding)
+
+    def flush(self):
+        # StreamHandler.emit flushes after every record; rely on the buffer
+        # instead. close() flushes the underlying stream when it closes it.
+        pass
+
+
 def init_logger(logger, level=logging.INFO, stream=True, outfname=time.strftime("blues-%Y%m%d-%H%M%S")):
     """Initialize the Logger module with the given logger_level and outfname.
 
@@ -116,7 +346,7 @@ def init_logger(logger, level=logging.INFO, stream=True, outfname=time.strftime(
 
     # Write to File
     if outfname:
-        fh = logging.FileHandler(outfname + '.log')
+        fh = _BufferedFileHandler(outfname + '.log')
         fh.setFormatter(fmt)
         logger.addHandler(fh)
 
@@ -294,6 +524,24 @@ class BLUESHDF5Reporter(HDF5Reporter):
     environment : bool
         True will attempt to export your conda environment to JSON and
         store the information in the HDF5 file. Useful for record keeping.
+    buffer_size : int, default=100
+        Number of frames to accumulate in memory before writing them to the
+        HDF5 file in a single batched call. Buffered frames are flushed when
+        the reporter is closed or garbage collected.
+    dtype : np.dtype, default=np.float32
+        Data type the coordinate/velocity arrays are cast to before writing.
+        The HDF5 datasets are stored in single precision, so the default
+        halves the bytes moved through the reporter with no loss on disk.
+    compression : str, default='blosc:lz4'
+        Compression filter for the HDF5 trajectory datasets, forwarded to
+        `BLUESHDF5TrajectoryFile` when `file` is a filename. blosc-lz4
+        compresses multi-threaded and several times faster than zlib at a
+        similar ratio; pass 'zlib' to restore the old behavior.
+    enabled : bool, default=True
+        If False the reporter is a permanent no-op: describeNextReport asks
+        for no State data and report() is never called. Setting the
+        BLUES_DISABLE_REPORTERS environment variable to 1 disables all BLUES
+        reporters the same way.
 
     Notes
     -----
@@ -325,8 +573,16 @@ class BLUESHDF5Reporter(HDF5Reporter):
                  protocolWork=True,
                  alchemicalLambda=True,
                  parameters=None,
-                 environment=True):
-
+                 environment=True,
+                 buffer_size=100,
+                 dtype=np.float32,
+                 compression='blosc:lz4',
+                 enabled=True):
+
+        #Open the backend ourselves so the compression choice reaches it;
+        #the base reporter accepts an already-open trajectory file.
+        if isinstance(file, str):
+            file = BLUESHDF5TrajectoryFile(file, 'w', compression=compression)
         super(BLUESHDF5Reporter, self).__init__(file, reportInterval, coordinates, time, cell, potentialEnergy,
                                                 kineticEnergy, temperature, velocities, atomSubset)
         self._protocolWork = bool(protocolWork)
@@ -336,11 +592,25 @@ class BLUESHDF5Reporter(HDF5Reporter):
         self._title = title
         self._parameters = parameters
 
+        self._buffer_size = max(1, int(buffer_size))
+        self._buffers = {}
+        self._buffered_frames = 0
+        self._dtype = np.dtype(dtype)
+        self._enabled = not _reporting_disabled(enabled)
+
         self.frame_indices = frame_indices
         if self.frame_indices:
             #If simulation.currentStep = 1, store the frame from the previous step.
             # i.e. frame_indices=[1,100] will store the first and frame 100
             self.frame_indices = [x - 1 for x in frame_indices]
+        self._frame_index_set = frozenset(self.frame_indices)
+        self._sorted_frames = np.sort(np.asarray(self.frame_indices, dtype=np.int64))
+
+        #Staging arrays for the unit cell, filled in place each frame and
+        #flushed as a single (n_frames, 3) slice, so report() never allocates
+        #tiny per-frame arrays.
+        self._cell_lengths_buf = np.empty((self._buffer_size, 3), dtype=self._dtype)
+        self._cell_angles_buf = np.empty((self._buffer_size, 3), dtype=self._dtype)
 
     def describeNextReport(self, simulation):
         """
@@ -359,17 +629,59 @@ class BLUESHDF5Reporter(HDF5Reporter):
             velocities, forces, and/or energies are needed from the Context
 
         """
+        if not self._enabled:
+            return (_NO_REPORTS, False, False, False, False)
         #Monkeypatch to report at certain frame indices
-        if self.frame_indices:
-            if simulation.currentStep in self.frame_indices:
+        if self._frame_index_set:
+            if simulation.currentStep in self._frame_index_set:
                 steps = 1
             else:
-                steps = -1
-        if not self.frame_indices:
+                steps = _steps_to_next_frame(self._sorted_frames, simulation.currentStep)
+                if steps == _NO_REPORTS:
+                    #Nothing left to report; don't ask the Context to build a
+                    #State with positions/velocities/energies nobody will use.
+                    return (steps, False, False, False, False)
+        else:
             steps_left = simulation.currentStep % self._reportInterval
             steps = self._reportInterval - steps_left
         return (steps, self._coordinates, self._velocities, False, self._needEnergy)
 
+    def _initialize(self, simulation):
+        """Resolve the trajectory file's distance unit once and cache the
+        scalar factors used to convert the raw position/velocity arrays,
+        so report() does not re-do the unit lookup and Quantity arithmetic
+        every frame.
+
+        Parameters
+        ----------
+        simulation : simtk.openmm.app.Simulation
+            The Simulation to generate a report for
+
+        """
+        super(BLUESHDF5Reporter, self)._initialize(simulation)
+        #OpenMM hands back positions in nanometers and velocities in
+        #nanometers/picosecond; scale the bare ndarrays into the file's units.
+        self._distance_unit = getattr(unit, self._traj_file.distance_unit)
+        self._pos_scale = (1.0 * unit.nanometer).value_in_unit(self._distance_unit)
+        self._vel_scale = (1.0 * unit.nanometer / unit.picosecond).value_in_unit(
+            self._distance_unit / unit.picosecond)
+
+    def _checkForErrors(self, simulation, state):
+        """Check the simulation for NaN/Inf values with a single vectorized test.
+
+        Parameters
+        ----------
+        simulation : simtk.openmm.app.Simulation
+            The Simulation to generate a report for
+        state : simtk.openmm.State
+            The current state of the simulation
+
+        """
+        if self._needEnergy:
+            energy = (state.getKineticEnergy() + state.getPotentialEnergy()).value_in_unit(unit.kilojoules_per_mole)
+            if not np.isfinite(energy):
+                raise ValueError('Energy is NaN or Inf.')
+
     def report(self, simulation, state):
         """Generate a report.
 
@@ -387,35 +699,62 @@ class BLUESHDF5Reporter(HDF5Reporter):
 
         self._checkForErrors(simulation, state)
 
-        args = ()
-        kwargs = {}
+        frame = {}
         if self._coordinates:
-            coordinates = state.getPositions(asNumpy=True)[self._atomSlice]
-            coordinates = coordinates.value_in_unit(getattr(unit, self._traj_file.distance_unit))
-            args = (coordinates, )
+            coordinates = _state_array(state, 'getPositions')[self._atomSlice] * self._pos_scale
+            if not np.all(np.isfinite(coordinates)):
+                raise ValueError('Positions are NaN or Inf.')
+            frame['coordinates'] = np.ascontiguousarray(coordinates, dtype=self._dtype)
         if self._time:
-            kwargs['time'] = state.getTime()
+            frame['time'] = state.getTime().value_in_unit(unit.picosecond)
         if self._cell:
             vectors = state.getPeriodicBoxVectors(asNumpy=True)
-            vectors = vectors.value_in_unit(getattr(unit, self._traj_file.distance_unit))
+            vectors = vectors.value_in_unit(self._distance_unit)
             a, b, c, alpha, beta, gamma = unitcell.box_vectors_to_lengths_and_angles(*vectors)
-            kwargs['cell_lengths'] = np.array([a, b, c])
-            kwargs['cell_angles'] = np.array([alpha, beta, gamma])
+            self._cell_lengths_buf[self._buffered_frames] = (a, b, c)
+            self._cell_angles_buf[self._buffered_frames] = (alpha, beta, gamma)
         if self._potentialEnergy:
-            kwargs['potentialEnergy'] = state.getPotentialEnergy()
+            frame['potentialEnergy'] = state.getPotentialEnergy().value_in_unit(unit.kilojoules_per_mole)
         if self._kineticEnergy:
-            kwargs['kineticEnergy'] = state.getKineticEnergy()
+            frame['kineticEnergy'] = state.getKineticEnergy().value_in_unit(unit.kilojoules_per_mole)
         if self._temperature:
-            kwargs['temperature'] = 2 * state.getKineticEnergy() / (self._dof * unit.MOLAR_GAS_CONSTANT_R)
+            temperature = 2 * state.getKineticEnergy() / (self._dof * unit.MOLAR_GAS_CONSTANT_R)
+            frame['temperature'] = temperature.value_in_unit(unit.kelvin)
         if self._velocities:
-            kwargs['velocities'] = state.getVelocities(asNumpy=True)[self._atomSlice, :]
+            velocities = _state_array(state, 'getVelocities')[self._atomSlice, :] * self._vel_scale
+            frame['velocities'] = np.ascontiguousarray(velocities, dtype=self._dtype)
 
         #add a portion like this to store things other than the protocol work
         if self._protocolWork:
-            protocol_work = simulation.integrator.get_protocol_work(dimensionless=True)
-            kwargs['protocolWork'] = np.array([protocol_work])
+            frame['protocolWork'] = simulation.integrator.get_protocol_work(dimensionless=True)
         if self._alchemicalLambda:
-            kwargs['alchemicalLambda'] = np.array([simulation.integrator.getGlobalVariableByName('lambda')])
+            frame['alchemicalLambda'] = simulation.integrator.getGlobalVariableByName('lambda')
+
+        # Accumulate frames in memory and write them out in batches, rather
+        # than flushing the HDF5 file on every report. The partial buffer is
+        # drained when the reporter is closed or garbage collected.
+        for key, value in frame.items():
+            self._buffers.setdefault(key, []).append(value)
+        self._buffered_frames += 1
+        if self._buffered_frames >= self._buffer_size:
+            self._flush_buffer()
+
+    def _flush_buffer(self):
+        """Write all buffered frames to the HDF5 file in a single batched call."""
+        if self._buffered_frames == 0:
+            return
+
+        args = ()
+        kwargs = {}
+        if 'coordinates' in self._buffers:
+            args = (np.asarray(self._buffers['coordinates']), )
+        for key in ('time', 'velocities', 'kineticEnergy', 'potentialEnergy', 'temperature', 'protocolWork',
+                    'alchemicalLambda'):
+            if key in self._buffers:
+                kwargs[key] = np.asarray(self._buffers[key])
+        if self._cell:
+            kwargs['cell_lengths'] = self._cell_lengths_buf[:self._buffered_frames]
+            kwargs['cell_angles'] = self._cell_angles_buf[:self._buffered_frames]
         if self._title:
             kwargs['title'] = self._title
         if self._parameters:
@@ -424,13 +763,13 @@ class BLUESHDF5Reporter(HDF5Reporter):
             kwargs['environment'] = self._environment
 
         self._traj_file.write(*args, **kwargs)
-        # flush the file to disk. it might not be necessary to do this every
-        # report, but this is the most proactive solution. We don't want to
-        # accumulate a lot of data in memory only to find out, at the very
-        # end of the run, that there wasn't enough space on disk to hold the
-        # data.
-        if hasattr(self._traj_file, 'flush'):
-            self._traj_file.flush()
+        self._buffers = {}
+        self._buffered_frames = 0
+
+    def close(self):
+        """Flush any buffered frames and close the underlying trajectory file."""
+        self._flush_buffer()
+        super(BLUESHDF5Reporter, self).close()
 
 
 class BLUESStateDataReporter(app.StateDataReporter):
@@ -492,6 +831,11 @@ class BLUESStateDataReporter(app.StateDataReporter):
         Write the protocolWork for the alchemical process in the NCMC simulation
     alchemicalLambda : bool=False,
         Write the alchemicalLambda step for the alchemical process in the NCMC simulation.
+    enabled : bool=True
+        If False the reporter is a permanent no-op: describeNextReport asks
+        for no State data and report() is never called. Setting the
+        BLUES_DISABLE_REPORTERS environment variable to 1 disables all BLUES
+        reporters the same way.
 
     """
 
@@ -517,19 +861,32 @@ class BLUESStateDataReporter(app.StateDataReporter):
                  totalSteps=None,
                  protocolWork=False,
                  alchemicalLambda=False,
-                 currentIter=False):
+                 currentIter=False,
+                 enabled=True):
         super(BLUESStateDataReporter, self).__init__(
             file, reportInterval, step, time, potentialEnergy, kineticEnergy, totalEnergy, temperature, volume,
             density, progress, remainingTime, speed, elapsedTime, separator, systemMass, totalSteps)
         self.log = self._out
         self.title = title
 
+        #Cached pieces of the hot report() path; the row format string is
+        #built on the first report once the column count is known. The emit
+        #method is resolved once here -- loggers configured by init_logger
+        #carry the custom REPORT level -- instead of re-testing hasattr and
+        #rebinding log.info on every report.
+        self._fmt = None
+        self._flush = getattr(self._out, 'flush', None)
+        self._emit = getattr(self._out, 'report', None) or self._out.info
+        self._enabled = not _reporting_disabled(enabled)
+
         self.frame_indices = frame_indices
         self._protocolWork, self._alchemicalLambda, self._currentIter = protocolWork, alchemicalLambda, currentIter
         if self.frame_indices:
             #If simulation.currentStep = 1, store the frame from the previous step.
             # i.e. frame_indices=[1,100] will store the first and frame 100
             self.frame_indices = [x - 1 for x in frame_indices]
+        self._frame_index_set = frozenset(self.frame_indices)
+        self._sorted_frames = np.sort(np.asarray(self.frame_indices, dtype=np.int64))
 
     def describeNextReport(self, simulation):
         """
@@ -548,13 +905,19 @@ class BLUESStateDataReporter(app.StateDataReporter):
             velocities, forces, and/or energies are needed from the Context
 
         """
+        if not self._enabled:
+            return (_NO_REPORTS, False, False, False, False)
         #Monkeypatch to report at certain frame indices
-        if self.frame_indices:
-            if simulation.currentStep in self.frame_indices:
+        if self._frame_index_set:
+            if simulation.currentStep in self._frame_index_set:
                 steps = 1
             else:
-                steps = -1
-        if not self.frame_indices:
+                steps = _steps_to_next_frame(self._sorted_frames, simulation.currentStep)
+                if steps == _NO_REPORTS:
+                    #Nothing left to report; don't ask the Context to build a
+                    #State with positions/velocities/energies nobody will use.
+                    return (steps, False, False, False, False)
+        else:
             steps_left = simulation.currentStep % self._reportInterval
             steps = self._reportInterval - steps_left
 
@@ -573,15 +936,14 @@ class BLUESStateDataReporter(app.StateDataReporter):
         if not self._hasInitialized:
             self._initializeConstants(simulation)
             headers = self._constructHeaders()
-            if hasattr(self.log, 'report'):
-                self.log.info = self.log.report
-            self.log.info('#"%s"' % ('"' + self._separator + '"').join(headers))
-            try:
-                self._out.flush()
-            except AttributeError:
-                pass
+            self._fmt = '%s: ' + self._separator.join(['%s'] * len(headers))
+            self._emit('#"%s"' % ('"' + self._separator + '"').join(headers))
+            if self._flush is not None:
+                self._flush()
             self._initialClockTime = time.time()
-            self._initialSimulationTime = state.getTime()
+            #OpenMM stores time in picoseconds internally; keep the bare
+            #float so the speed estimate never re-enters Quantity arithmetic.
+            self._initialSimulationTime_ps = state.getTime()._value
             self._initialSteps = simulation.currentStep
             self._hasInitialized = True
 
@@ -591,100 +953,149 @@ class BLUESStateDataReporter(app.StateDataReporter):
         values = self._constructReportValues(simulation, state)
 
         # Write the values.
-        if hasattr(self.log, 'report'):
-            self.log.info = self.log.report
-        self.log.info('%s: %s' % (self.title, self._separator.join(str(v) for v in values)))
-        try:
-            self._out.flush()
-        except AttributeError:
-            pass
+        self._emit(self._fmt % ((self.title, ) + tuple(values)))
+        if self._flush is not None:
+            self._flush()
 
-    def _constructReportValues(self, simulation, state):
-        """Query the simulation for the current state of our observables of interest.
+    def _initializeConstants(self, simulation):
+        """Initialize a set of constants required for the reports, then build
+        the per-column dispatch table used by _constructReportValues() and
+        _constructHeaders(). The boolean column flags are immutable after
+        construction, so the flag checks run once here instead of on every
+        report.
 
         Parameters
         ----------
         simulation : Simulation
-            The Simulation to generate a report for
-        state : State
-            The current state of the simulation
-
-        Returns
-        -------
-        values : list
-            A list of values summarizing the current state of the simulation,
-            to be printed or saved. Each element in the list corresponds to one
-            of the columns in the resulting CSV file.
+            The simulation to generate a report for
         """
-        values = []
-        box = state.getPeriodicBoxVectors()
-        volume = box[0][0] * box[1][1] * box[2][2]
-        clockTime = time.time()
+        super(BLUESStateDataReporter, self)._initializeConstants(simulation)
+
+        if self._density:
+            #Resolving the composite g/mL unit expression is surprisingly
+            #expensive, so convert the total mass and the dalton/nm^3 -> g/mL
+            #factor once and leave the per-report math on bare floats.
+            self._total_mass_dalton = self._totalMass.value_in_unit(_DALTON)
+            self._density_scale = (_DALTON / _NM3).conversion_factor_to(_G_PER_ML)
+
+        #Any energy-derived column shares the two Quantity objects pulled
+        #once per report in _constructReportValues().
+        self._needsEnergyPair = (self._potentialEnergy or self._kineticEnergy or self._totalEnergy
+                                 or self._temperature)
+
+        #Each column is a (header, getter) pair; the getters share the
+        #signature (simulation, state, volume, clockTime, pe, ke).
+        columns = []
         if self._currentIter:
-            if not hasattr(simulation, 'currentIter'):
-                simulation.currentIter = 0
-            values.append(simulation.currentIter)
+
+            def currentIter(simulation, state, volume, clockTime, pe, ke):
+                if not hasattr(simulation, 'currentIter'):
+                    simulation.currentIter = 0
+                return simulation.currentIter
+
+            columns.append(('Iter', currentIter))
         if self._progress:
-            values.append('%.1f%%' % (100.0 * simulation.currentStep / self._totalSteps))
+            columns.append(('Progress (%)', lambda simulation, state, volume, clockTime, pe, ke: '%.1f%%' %
+                            (100.0 * simulation.currentStep / self._totalSteps)))
         if self._step:
-            values.append(simulation.currentStep)
+            columns.append(('Step', lambda simulation, state, volume, clockTime, pe, ke: simulation.currentStep))
         if self._time:
-            values.append(state.getTime().value_in_unit(unit.picosecond))
+            columns.append(('Time (ps)', lambda simulation, state, volume, clockTime, pe, ke: state.getTime()._value))
         #add a portion like this to store things other than the protocol work
         if self._alchemicalLambda:
-            alchemicalLambda = simulation.integrator.getGlobalVariableByName('lambda')
-            values.append(alchemicalLambda)
+            columns.append(('alchemicalLambda', lambda simulation, state, volume, clockTime, pe, ke: simulation.integrator.
+                            getGlobalVariableByName('lambda')))
         if self._protocolWork:
-            protocolWork = simulation.integrator.get_protocol_work(dimensionless=True)
-            values.append(protocolWork)
+            columns.append(('protocolWork', lambda simulation, state, volume, clockTime, pe, ke: simulation.integrator.
+                            get_protocol_work(dimensionless=True)))
         if self._potentialEnergy:
-            values.append(state.getPotentialEnergy().value_in_unit(unit.kilojoules_per_mole))
+            columns.append(('Potential Energy (kJ/mole)',
+                            lambda simulation, state, volume, clockTime, pe, ke: pe.value_in_unit(_KJ_PER_MOL)))
         if self._kineticEnergy:
-            values.append(state.getKineticEnergy().value_in_unit(unit.kilojoules_per_mole))
+            columns.append(('Kinetic Energy (kJ/mole)',
+                            lambda simulation, state, volume, clockTime, pe, ke: ke.value_in_unit(_KJ_PER_MOL)))
         if self._totalEnergy:
-            values.append(
-                (state.getKineticEnergy() + state.getPotentialEnergy()).value_in_unit(unit.kilojoules_per_mole))
+            columns.append(('Total Energy (kJ/mole)',
+                            lambda simulation, state, volume, clockTime, pe, ke: (ke + pe).value_in_unit(_KJ_PER_MOL)))
         if self._temperature:
-            values.append(
-                (2 * state.getKineticEnergy() / (self._dof * unit.MOLAR_GAS_CONSTANT_R)).value_in_unit(unit.kelvin))
+            columns.append(('Temperature (K)', lambda simulation, state, volume, clockTime, pe, ke:
+                            (2 * ke / (self._dof * unit.MOLAR_GAS_CONSTANT_R)).value_in_unit(_KELVIN)))
         if self._volume:
-            values.append(volume.value_in_unit(unit.nanometer**3))
+            columns.append(('Box Volume (nm^3)', lambda simulation, state, volume, clockTime, pe, ke: volume))
         if self._density:
-            values.append((self._totalMass / volume).value_in_unit(unit.gram / unit.item / unit.milliliter))
-
+            columns.append(('Density (g/mL)', lambda simulation, state, volume, clockTime, pe, ke: self._total_mass_dalton /
+                            volume * self._density_scale))
         if self._speed:
-            elapsedDays = (clockTime - self._initialClockTime) / 86400.0
-            elapsedNs = (state.getTime() - self._initialSimulationTime).value_in_unit(unit.nanosecond)
-            if elapsedDays > 0.0:
-                values.append('%.3g' % (elapsedNs / elapsedDays))
-            else:
-                values.append('--')
+
+            def speed(simulation, state, volume, clockTime, pe, ke):
+                elapsedDays = (clockTime - self._initialClockTime) / 86400.0
+                elapsedNs = (state.getTime()._value - self._initialSimulationTime_ps) * 1e-3
+                if elapsedDays > 0.0:
+                    return '%.3g' % (elapsedNs / elapsedDays)
+                return '--'
+
+            columns.append(('Speed (ns/day)', speed))
         if self._elapsedTime:
-            values.append(time.time() - self._initialClockTime)
+            columns.append(('Elapsed Time (s)',
+                            lambda simulation, state, volume, clockTime, pe, ke: time.time() - self._initialClockTime))
         if self._remainingTime:
-            elapsedSeconds = clockTime - self._initialClockTime
-            elapsedSteps = simulation.currentStep - self._initialSteps
-            if elapsedSteps == 0:
-                value = '--'
-            else:
+
+            def remainingTime(simulation, state, volume, clockTime, pe, ke):
+                elapsedSeconds = clockTime - self._initialClockTime
+                elapsedSteps = simulation.currentStep - self._initialSteps
+                if elapsedSteps == 0:
+                    return '--'
                 estimatedTotalSeconds = (self._totalSteps - self._initialSteps) * elapsedSeconds / elapsedSteps
                 remainingSeconds = int(estimatedTotalSeconds - elapsedSeconds)
-                remainingDays = remainingSeconds // 86400
-                remainingSeconds -= remainingDays * 86400
-                remainingHours = remainingSeconds // 3600
-                remainingSeconds -= remainingHours * 3600
-                remainingMinutes = remainingSeconds // 60
-                remainingSeconds -= remainingMinutes * 60
+                remainingDays, remainingSeconds = divmod(remainingSeconds, 86400)
+                remainingHours, remainingSeconds = divmod(remainingSeconds, 3600)
+                remainingMinutes, remainingSeconds = divmod(remainingSeconds, 60)
                 if remainingDays > 0:
-                    value = "%d:%d:%02d:%02d" % (remainingDays, remainingHours, remainingMinutes, remainingSeconds)
+                    return "%d:%d:%02d:%02d" % (remainingDays, remainingHours, remainingMinutes, remainingSeconds)
                 elif remainingHours > 0:
-                    value = "%d:%02d:%02d" % (remainingHours, remainingMinutes, remainingSeconds)
+                    return "%d:%02d:%02d" % (remainingHours, remainingMinutes, remainingSeconds)
                 elif remainingMinutes > 0:
-                    value = "%d:%02d" % (remainingMinutes, remainingSeconds)
-                else:
-                    value = "0:%02d" % remainingSeconds
-            values.append(value)
-        return values
+                    return "%d:%02d" % (remainingMinutes, remainingSeconds)
+                return "0:%02d" % remainingSeconds
+
+            columns.append(('Time Remaining', remainingTime))
+        self._columns = columns
+        #Specialized views of the table for the hot path: a plain tuple of
+        #getters to iterate per report, plus the fixed header list and width.
+        self._headers = [header for header, _ in columns]
+        self._getters = tuple(getter for _, getter in columns)
+        self._ncols = len(columns)
+
+    def _constructReportValues(self, simulation, state):
+        """Query the simulation for the current state of our observables of interest.
+
+        Parameters
+        ----------
+        simulation : Simulation
+            The Simulation to generate a report for
+        state : State
+            The current state of the simulation
+
+        Returns
+        -------
+        values : list
+            A list of values summarizing the current state of the simulation,
+            to be printed or saved. Each element in the list corresponds to one
+            of the columns in the resulting CSV file.
+        """
+        #The determinant handles triclinic boxes correctly, unlike the old
+        #product of the diagonal; volume is carried as a bare float in nm^3.
+        box = state.getPeriodicBoxVectors(asNumpy=True).value_in_unit(_NM)
+        volume = abs(np.linalg.det(box))
+        clockTime = time.time()
+        #Pull the two energy Quantities at most once per report; up to four
+        #columns derive from them.
+        if self._needsEnergyPair:
+            pe = state.getPotentialEnergy()
+            ke = state.getKineticEnergy()
+        else:
+            pe = ke = None
+        return [getter(simulation, state, volume, clockTime, pe, ke) for getter in self._getters]
 
     def _constructHeaders(self):
         """Construct the headers for the CSV output
@@ -694,38 +1105,7 @@ class BLUESStateDataReporter(app.StateDataReporter):
         headers : list
             a list of strings giving the title of each observable being reported on.
         """
-        headers = []
-        if self._currentIter:
-            headers.append('Iter')
-        if self._progress:
-            headers.append('Progress (%)')
-        if self._step:
-            headers.append('Step')
-        if self._time:
-            headers.append('Time (ps)')
-        if self._alchemicalLambda:
-            headers.append('alchemicalLambda')
-        if self._protocolWork:
-            headers.append('protocolWork')
-        if self._potentialEnergy:
-            headers.append('Potential Energy (kJ/mole)')
-        if self._kineticEnergy:
-            headers.append('Kinetic Energy (kJ/mole)')
-        if self._totalEnergy:
-            headers.append('Total Energy (kJ/mole)')
-        if self._temperature:
-            headers.append('Temperature (K)')
-        if self._volume:
-            headers.append('Box Volume (nm^3)')
-        if self._density:
-            headers.append('Density (g/mL)')
-        if self._speed:
-            headers.append('Speed (ns/day)')
-        if self._elapsedTime:
-            headers.append('Elapsed Time (s)')
-        if self._remainingTime:
-            headers.append('Time Remaining')
-        return headers
+        return list(self._headers)
 
 
 class NetCDF4Reporter(parmed.openmm.reporters.NetCDFReporter):
@@ -752,6 +1132,13 @@ class NetCDF4Reporter(parmed.openmm.reporters.NetCDFReporter):
         Write the protocolWork for the alchemical process in the NCMC simulation
     alchemicalLambda : bool=False,
         Write the alchemicalLambda step for the alchemical process in the NCMC simulation.
+    buffer_size : int, default=64
+        Number of frames to accumulate in memory before they are written to
+        the NetCDF file in a single slab per variable. Buffered frames are
+        flushed when the reporter is closed (or garbage collected).
+    quantize : bool, default=False
+        Store velocities as int16 fixed point (with a NetCDF ``scale_factor``
+        so readers rescale transparently), halving the velocity storage.
     """
 
     def __init__(self,
@@ -762,17 +1149,93 @@ class NetCDF4Reporter(parmed.openmm.reporters.NetCDFReporter):
                  vels=False,
                  frcs=False,
                  protocolWork=False,
-                 alchemicalLambda=False):
+                 alchemicalLambda=False,
+                 buffer_size=64,
+                 quantize=False):
         """
         Create a NetCDFReporter instance.
         """
-        super(NetCDF4Reporter, self).__init__(file, reportInterval, crds, vels, frcs)
+        #The file layout needs at least one per-atom array (it also supplies
+        #the atom count on the first report); parmed's constructor enforced
+        #this before the super() call was dropped.
+        if not (crds or vels or frcs):
+            raise ValueError('You must print either coordinates, velocities, or forces for a NetCDFReporter')
+        #parmed's __init__ only stashes these three attributes (its
+        #describeNextReport and report are both overridden here), so assign
+        #them directly rather than chaining up through its extra checks.
+        self.fname = file
+        self._reportInterval = reportInterval
+        self._out = None
+        self._quantize = bool(quantize)
+        #OpenMM hands back Quantities in its native nm/ps-based units; cache
+        #the conversion factors once so report() can scale the raw arrays
+        #instead of going through value_in_unit's generic path.
+        self._pos_scale = (1.0 * u.nanometer).value_in_unit(u.angstrom)
+        self._vel_scale = (1.0 * u.nanometer / u.picosecond).value_in_unit(VELUNIT)
+        self._frc_scale = (1.0 * u.kilojoule_per_mole / u.nanometer).value_in_unit(FRCUNIT)
+        #The flags never change after construction, so specialize the
+        #per-frame extraction into (buffer key, getter) pairs once; report()
+        #iterates this tuple instead of re-testing five booleans per call.
+        #The per-atom arrays come back raw; _scale_into applies the unit
+        #conversion while copying into the (float32) staging row, so no
+        #scaled temporary is ever allocated.
+        ops = []
+        if crds:
+            ops.append(('coordinates', lambda simulation, state:
+                        _state_array(state, 'getPositions')))
+        if vels:
+            # The velocities get scaled again right before writing
+            ops.append(('velocities', lambda simulation, state:
+                        _state_array(state, 'getVelocities')))
+        if frcs:
+            ops.append(('forces', lambda simulation, state:
+                        _state_array(state, 'getForces')))
+        if protocolWork:
+            ops.append(('protocolWork', lambda simulation, state:
+                        simulation.integrator.get_protocol_work(dimensionless=True)))
+        if alchemicalLambda:
+            ops.append(('alchemicalLambda', lambda simulation, state:
+                        simulation.integrator.getGlobalVariableByName('lambda')))
+        self._frame_ops = tuple(ops)
+        self._array_scales = {}
+        if crds:
+            self._array_scales['coordinates'] = self._pos_scale
+        if vels:
+            self._array_scales['velocities'] = self._vel_scale
+        if frcs:
+            self._array_scales['forces'] = self._frc_scale
         self.crds, self.vels, self.frcs, self.protocolWork, self.alchemicalLambda = crds, vels, frcs, protocolWork, alchemicalLambda
-        self.frame_indices = frame_indices
-        if self.frame_indices:
-            #If simulation.currentStep = 1, store the frame from the previous step.
-            # i.e. frame_indices=[1,100] will store the first and frame 100
-            self.frame_indices = [x - 1 for x in frame_indices]
+        self._buffer_size = max(1, int(buffer_size))
+        #Staging arrays are allocated on the first report, once the atom
+        #count is known.
+        self._buffers = None
+        self._buffered = 0
+        self._nwritten = 0
+        #Box vectors from the last report, and the lengths/angles derived
+        #from them; reused as long as the box stays fixed.
+        self._last_box = None
+        self._last_cell = None
+        #Started lazily at the first flush; the writer thread overlaps the
+        #NetCDF writes with the next stretch of MD steps. It shares only
+        #the queue, the trajectory and this exception list, so it never
+        #keeps the reporter itself alive.
+        self._queue = None
+        self._writer = None
+        self._writer_exc = []
+        #Resolved from the Topology on the first describeNextReport call.
+        self.uses_pbc = None
+        #If simulation.currentStep = 1, store the frame from the previous step.
+        # i.e. frame_indices=[1,100] will store the first and frame 100
+        #The shift is one vectorized subtraction rather than a Python loop,
+        #which matters for the long schedules lambda windows expand into.
+        arr = np.asarray(frame_indices, dtype=np.int64)
+        if arr.size:
+            arr = arr - 1
+        self.frame_indices = arr
+        self._frame_index_set = frozenset(arr.tolist())
+        self._sorted_frames = np.sort(arr)
+        #Dense schedules get a packed bitmask for branchless membership.
+        self._frame_bits = _pack_frame_bits(arr)
 
     def describeNextReport(self, simulation):
         """
@@ -790,13 +1253,26 @@ class NetCDF4Reporter(parmed.openmm.reporters.NetCDFReporter):
             pos, vel, frc, and ene are flags indicating whether positions,
             velocities, forces, and/or energies are needed from the Context
         """
+        #Cache whether the system is periodic so report() never has to
+        #re-query the topology.
+        if self.uses_pbc is None:
+            self.uses_pbc = simulation.topology.getUnitCellDimensions() is not None
         #Monkeypatch to report at certain frame indices
-        if self.frame_indices:
-            if simulation.currentStep in self.frame_indices:
+        if self._frame_index_set:
+            step = simulation.currentStep
+            if self._frame_bits is not None:
+                hit = _frame_bit_set(self._frame_bits, step)
+            else:
+                hit = step in self._frame_index_set
+            if hit:
                 steps = 1
             else:
-                steps = -1
-        if not self.frame_indices:
+                steps = _steps_to_next_frame(self._sorted_frames, step)
+                if steps == _NO_REPORTS:
+                    #Nothing left to report; don't ask the Context for data
+                    #nobody will use.
+                    return (steps, False, False, False, False)
+        else:
             steps_left = simulation.currentStep % self._reportInterval
             steps = self._reportInterval - steps_left
         return (steps, self.crds, self.vels, self.frcs, False)
@@ -812,26 +1288,18 @@ class NetCDF4Reporter(parmed.openmm.reporters.NetCDFReporter):
             The current state of the simulation
 
         """
-        global VELUNIT, FRCUNIT
-        if self.crds:
-            crds = state.getPositions().value_in_unit(u.angstrom)
-        if self.vels:
-            vels = state.getVelocities().value_in_unit(VELUNIT)
-        if self.frcs:
-            frcs = state.getForces().value_in_unit(FRCUNIT)
-        if self.protocolWork:
-            protocolWork = simulation.integrator.get_protocol_work(dimensionless=True)
-        if self.alchemicalLambda:
-            alchemicalLambda = simulation.integrator.getGlobalVariableByName('lambda')
+        if not self._frame_ops:
+            #Nothing was requested for this frame; skip the State queries and
+            #file setup entirely.
+            return
+        #The flags are fixed at construction, so the per-frame work is a
+        #walk over the precomputed ops instead of a chain of branches.
+        values = [getter(simulation, state) for _key, getter in self._frame_ops]
         if self._out is None:
             # This must be the first frame, so set up the trajectory now
-            if self.crds:
-                atom = len(crds)
-            elif self.vels:
-                atom = len(vels)
-            elif self.frcs:
-                atom = len(frcs)
-            self.uses_pbc = simulation.topology.getUnitCellDimensions() is not None
+            atom = next(v.shape[0] for v in values if getattr(v, 'ndim', 0) == 2)
+            if self.uses_pbc is None:
+                self.uses_pbc = simulation.topology.getUnitCellDimensions() is not None
             self._out = NetCDF4Traj.open_new(
                 self.fname,
                 atom,
@@ -842,24 +1310,126 @@ class NetCDF4Reporter(parmed.openmm.reporters.NetCDFReporter):
                 title="ParmEd-created trajectory using OpenMM",
                 protocolWork=self.protocolWork,
                 alchemicalLambda=self.alchemicalLambda,
+                quantize=self._quantize,
             )
-
+            #Silence the sync that the legacy per-frame add_* paths issue on
+            #every value; the writer thread syncs once per flushed batch
+            #instead, so readers still see the frames written so far and a
+            #killed run loses at most the current batch.
+            self._out.sync_on_write = False
+        if self._buffers is None:
+            self._allocate_buffers(self._out.atom)
+
+        # Stage this frame in the in-memory buffers; the actual disk write
+        # happens in batches of buffer_size frames.
+        idx = self._buffered
         if self.uses_pbc:
-            vecs = state.getPeriodicBoxVectors()
-            lengths, angles = box_vectors_to_lengths_and_angles(*vecs)
-            self._out.add_cell_lengths_angles(lengths.value_in_unit(u.angstrom), angles.value_in_unit(u.degree))
-
-        # Add the coordinates, velocities, and/or forces as needed
+            box = state.getPeriodicBoxVectors(asNumpy=True)._value
+            if self._last_box is None or not np.array_equal(box, self._last_box):
+                #Inline the lengths/angles math on the raw 3x3 box matrix; the
+                #pure-Python trig in parmed's box_vectors_to_lengths_and_angles
+                #costs far more than the six floats it produces. For NVT runs
+                #the box never changes, so this branch runs exactly once.
+                M = box * self._pos_scale
+                L = np.linalg.norm(M, axis=1)
+                cosang = np.array([
+                    np.dot(M[1], M[2]) / (L[1] * L[2]),
+                    np.dot(M[0], M[2]) / (L[0] * L[2]),
+                    np.dot(M[0], M[1]) / (L[0] * L[1]),
+                ])
+                self._last_box = box.copy()
+                self._last_cell = (L, np.degrees(np.arccos(cosang)))
+            self._buffers['cell_lengths'][idx] = self._last_cell[0]
+            self._buffers['cell_angles'][idx] = self._last_cell[1]
+        for (key, _getter), value in zip(self._frame_ops, values):
+            scale = self._array_scales.get(key)
+            if scale is None:
+                self._buffers[key][idx] = value
+            else:
+                _scale_into(value, scale, self._buffers[key][idx])
+        #getTime() is already in picoseconds, OpenMM's native time unit.
+        self._buffers['time'][idx] = state.getTime()._value
+        self._buffered += 1
+        if self._buffered >= self._buffer_size:
+            self._flush_frames()
+
+    def _allocate_buffers(self, natom):
+        """Allocate the per-variable staging arrays for ``buffer_size`` frames."""
+        n = self._buffer_size
+        self._buffers = {'time': np.empty(n)}
         if self.crds:
-            self._out.add_coordinates(crds)
+            self._buffers['coordinates'] = np.empty((n, natom, 3), dtype=np.float32)
         if self.vels:
-            # The velocities get scaled right before writing
-            self._out.add_velocities(vels)
+            self._buffers['velocities'] = np.empty((n, natom, 3), dtype=np.float32)
         if self.frcs:
-            self._out.add_forces(frcs)
+            self._buffers['forces'] = np.empty((n, natom, 3), dtype=np.float32)
+        if self.uses_pbc:
+            self._buffers['cell_lengths'] = np.empty((n, 3))
+            self._buffers['cell_angles'] = np.empty((n, 3))
         if self.protocolWork:
-            self._out.add_protocolWork(protocolWork)
+            self._buffers['protocolWork'] = np.empty(n, dtype=np.float32)
         if self.alchemicalLambda:
-            self._out.add_alchemicalLambda(alchemicalLambda)
-        # Now it's time to add the time.
-        self._out.add_time(state.getTime().value_in_unit(u.picosecond))
+            self._buffers['alchemicalLambda'] = np.empty(n, dtype=np.float32)
+
+    def _flush_frames(self):
+        """Hand all buffered frames to the writer thread as one work item."""
+        n = self._buffered
+        if not n or self._out is None:
+            return
+        if self._writer_exc:
+            raise self._writer_exc.pop()
+        if self._writer is None:
+            self._queue = queue.Queue(maxsize=16)
+            self._writer = threading.Thread(
+                target=_drain_writes, args=(self._queue, self._out, self._writer_exc), daemon=True)
+            self._writer.start()
+        start, stop = self._nwritten, self._nwritten + n
+        #Package the batch as final variable-name -> slab pairs; the staged
+        #slices are copied (or converted) so the staging buffers can be
+        #reused while the writer thread drains this item.
+        data = {'time': self._buffers['time'][:n].copy()}
+        if self.crds:
+            data['coordinates'] = self._buffers['coordinates'][:n].copy()
+        if self.vels:
+            vels_out = self._buffers['velocities'][:n] / self._out.velocity_scale
+            if self._quantize:
+                vels_out = np.rint(vels_out).astype(np.int16)
+            data['velocities'] = vels_out
+        if self.frcs:
+            data['forces'] = self._buffers['forces'][:n].copy()
+        if self.uses_pbc:
+            data['cell_lengths'] = self._buffers['cell_lengths'][:n].copy()
+            data['cell_angles'] = self._buffers['cell_angles'][:n].copy()
+        if self.protocolWork and self.alchemicalLambda:
+            #Both scalars live in the fused (frame, 2) trace variable; one
+            #hyperslab covers the pair for the whole batch.
+            data['ncmc_trace'] = np.column_stack(
+                (self._buffers['protocolWork'][:n], self._buffers['alchemicalLambda'][:n]))
+        elif self.protocolWork:
+            data['protocolWork'] = self._buffers['protocolWork'][:n].copy()
+        elif self.alchemicalLambda:
+            data['alchemicalLambda'] = self._buffers['alchemicalLambda'][:n].copy()
+        self._nwritten = stop
+        self._buffered = 0
+        #A full queue blocks here, throttling the simulation instead of
+        #accumulating unbounded copies.
+        self._queue.put((start, stop, data))
+
+    def close(self):
+        """Flush any buffered frames, stop the writer and close the file."""
+        self._flush_frames()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        if self._writer_exc:
+            raise self._writer_exc.pop()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,43 @@
+import numpy as np
+
+from blues.formats import NetCDF4Traj
+
+
+def test_fused_ncmc_trace_roundtrip(tmpdir):
+    """Recording both NCMC scalars uses the fused (frame, 2) variable, and the
+    protocolWork/alchemicalLambda properties read the columns back."""
+    fname = str(tmpdir.join('fused.nc'))
+    traj = NetCDF4Traj.open_new(fname, 3, False, crds=True, protocolWork=True, alchemicalLambda=True)
+    work = [0.5, 1.25, -2.75]
+    lambdas = [0.0, 0.5, 1.0]
+    for w, l in zip(work, lambdas):
+        traj.add_protocolWork(w)
+        traj.add_alchemicalLambda(l)
+    assert 'ncmc_trace' in traj._ncfile.variables
+    assert 'protocolWork' not in traj._ncfile.variables
+    assert 'alchemicalLambda' not in traj._ncfile.variables
+    np.testing.assert_allclose(traj.protocolWork, work)
+    np.testing.assert_allclose(traj.alchemicalLambda, lambdas)
+    traj.close()
+
+
+def test_protocolWork_only_keeps_scalar_layout(tmpdir):
+    """A file recording a single NCMC scalar keeps the old one-variable layout."""
+    fname = str(tmpdir.join('work_only.nc'))
+    traj = NetCDF4Traj.open_new(fname, 3, False, crds=True, protocolWork=True)
+    traj.add_protocolWork(0.5)
+    traj.add_protocolWork(1.25)
+    assert 'ncmc_trace' not in traj._ncfile.variables
+    np.testing.assert_allclose(traj.protocolWork, [0.5, 1.25])
+    traj.close()
+
+
+def test_alchemicalLambda_only_keeps_scalar_layout(tmpdir):
+    """Same fallback for a file recording only alchemicalLambda."""
+    fname = str(tmpdir.join('lambda_only.nc'))
+    traj = NetCDF4Traj.open_new(fname, 3, False, crds=True, alchemicalLambda=True)
+    traj.add_alchemicalLambda(0.25)
+    traj.add_alchemicalLambda(0.75)
+    assert 'ncmc_trace' not in traj._ncfile.variables
+    np.testing.assert_allclose(traj.alchemicalLambda, [0.25, 0.75])
+    traj.close()
@@ -0,0 +1,58 @@
+import numpy as np
+
+from blues.formats import NetCDF4Traj
+from blues.reporters import NetCDF4Reporter
+
+
+class _StubTopology:
+    def getUnitCellDimensions(self):
+        return None
+
+
+class _StubSimulation:
+    """The minimal surface describeNextReport touches."""
+
+    def __init__(self, currentStep):
+        self.currentStep = currentStep
+        self.topology = _StubTopology()
+
+
+def test_frame_indices_scheduling(tmpdir):
+    """describeNextReport over a frame_indices schedule: approaching a frame,
+    sitting on one, between frames, and past the end of the schedule."""
+    rep = NetCDF4Reporter(str(tmpdir.join('sched.nc')), reportInterval=1, frame_indices=[2, 5])
+    #frame_indices are shifted by one on storage, so reports fire at
+    #steps 2 and 5.
+    steps, crds, vels, frcs, ene = rep.describeNextReport(_StubSimulation(0))
+    assert steps == 2
+    assert crds and not vels and not frcs and not ene
+    #Sitting on a stored index: the report fires on the next step.
+    assert rep.describeNextReport(_StubSimulation(1))[0] == 1
+    #Between frames: skip straight ahead to step 5.
+    assert rep.describeNextReport(_StubSimulation(3))[0] == 2
+    assert rep.describeNextReport(_StubSimulation(4))[0] == 1
+    #Schedule exhausted: a huge step count and no State data requested.
+    steps, crds, vels, frcs, ene = rep.describeNextReport(_StubSimulation(5))
+    assert steps > 10**6
+    assert not (crds or vels or frcs or ene)
+
+
+def test_report_interval_scheduling(tmpdir):
+    """Without frame_indices the plain reportInterval arithmetic applies."""
+    rep = NetCDF4Reporter(str(tmpdir.join('interval.nc')), reportInterval=10)
+    assert rep.describeNextReport(_StubSimulation(0))[0] == 10
+    assert rep.describeNextReport(_StubSimulation(3))[0] == 7
+    assert rep.describeNextReport(_StubSimulation(10))[0] == 10
+
+
+def test_quantized_velocity_roundtrip(tmpdir):
+    """int16 velocities written the way the reporter writes them read back
+    within half a quantization step."""
+    fname = str(tmpdir.join('quant.nc'))
+    traj = NetCDF4Traj.open_new(fname, 2, False, crds=False, vels=True, quantize=True)
+    vels = np.array([[[1.5, -2.25, 0.0], [30.0, -30.0, 0.125]]])
+    traj._ncfile.variables['velocities'][0:1] = np.rint(vels / traj.velocity_scale).astype(np.int16)
+    stored = traj._ncfile.variables['velocities'][0:1]
+    assert stored.dtype == np.int16
+    np.testing.assert_allclose(stored * traj.velocity_scale, vels, atol=traj.velocity_scale / 2)
+    traj.close()